@@ -1,24 +1,40 @@
-import re
+from functools import lru_cache
 
-from markupsafe import Markup
+from markupsafe import Markup, escape
 
+from ._regex import re_identifier
 
+
+@lru_cache(maxsize=4096, typed=True)
 def do_crossref(path: str, brief: bool = True) -> Markup:
     """Filter to create cross-references.
 
+    The same paths are usually referenced many times, and `Markup` is immutable, so the results are cached.
+    A `Markup` path is not escaped, unlike a `str` with the same text, so the cache keeps them apart.
+
     Parameters:
         path: The path to link to.
         brief: Show only the last part of the path, add the full path as hover.
 
     Returns:
         Markup text.
+
+    Examples:
+        >>> do_crossref("foo.bar.Baz")
+        Markup('<span data-autorefs-optional-hover=foo.bar.Baz>Baz</span>')
+        >>> do_crossref("Baz")
+        Markup('<span data-autorefs-optional-hover=Baz>Baz</span>')
+        >>> do_crossref("a.<b>")
+        Markup('<span data-autorefs-optional-hover=a.&lt;b&gt;>&lt;b&gt;</span>')
+        >>> do_crossref(Markup("a.<b>"))
+        Markup('<span data-autorefs-optional-hover=a.<b>><b></span>')
     """
-    full_path = path
+    full_path = escape(path)
     if brief:
-        path = full_path.split(".")[-1]
+        path = path.rpartition(".")[2]
     return Markup(
-        "<span data-autorefs-optional-hover={full_path}>{path}</span>"
-    ).format(full_path=full_path, path=path)
+        f"<span data-autorefs-optional-hover={full_path}>{escape(path)}</span>"
+    )
 
 
 def do_multi_crossref(text: str, code: bool = True) -> Markup:
@@ -30,21 +46,23 @@ def do_multi_crossref(text: str, code: bool = True) -> Markup:
 
     Returns:
         Markup text.
+
+    Examples:
+        >>> do_multi_crossref("foo.Bar, baz", code=False)
+        Markup('<span data-autorefs-optional-hover=foo.Bar>foo.Bar</span>, <span data-autorefs-optional-hover=baz>baz</span>')
+        >>> do_multi_crossref("{x}")
+        Markup('<code>{<span data-autorefs-optional-hover=x>x</span>}</code>')
     """
-    group_number = 0
-    variables = {}
-
-    def repl(match: re.Match[str]) -> str:
-        nonlocal group_number
-        group_number += 1
-        path = match.group()
-        path_var = f"path{group_number}"
-        variables[path_var] = path
-        return (
-            f"<span data-autorefs-optional-hover={{{path_var}}}>{{{path_var}}}</span>"
-        )
-
-    text = re.sub(r"([\w.]+)", repl, text)
+    parts = []
+    last = 0
+    for match in re_identifier.finditer(text):
+        parts.append(escape(text[last : match.start()]))
+        path = escape(match.group())
+        parts.append(Markup(f"<span data-autorefs-optional-hover={path}>{path}</span>"))
+        last = match.end()
+    parts.append(escape(text[last:]))
+
+    result = Markup("").join(parts)
     if code:
-        text = f"<code>{text}</code>"
-    return Markup(text).format(**variables)
+        result = Markup(f"<code>{result}</code>")
+    return result
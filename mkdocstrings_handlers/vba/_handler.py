@@ -4,10 +4,12 @@ This module implements a handler for the VBA language.
 
 from __future__ import annotations
 
-import copy
 import posixpath
-from collections import ChainMap
+import sys
+from functools import partial
+from locale import getpreferredencoding
 from pathlib import Path
+from types import MappingProxyType
 from typing import (
     Any,
     BinaryIO,
@@ -17,23 +19,38 @@ from typing import (
     MutableMapping,
     Dict,
     Mapping,
-    Set,
 )
 
+from griffe.dataclasses import Docstring
 from griffe.logger import patch_loggers
+from jinja2 import Template
 from markdown import Markdown
 from mkdocs.exceptions import PluginError
-from mkdocstrings.handlers.base import BaseHandler
+from mkdocstrings.handlers.base import BaseHandler, CollectionError
 from mkdocstrings.inventory import Inventory
 from mkdocstrings.loggers import get_logger
 
 from ._crossref import do_crossref, do_multi_crossref
 from ._sort import Order, do_order_members
 from ._types import VbaModuleInfo
-from ._util import find_file_docstring, collapse_long_lines, find_procedures
+from ._util import (
+    collapse_long_lines,
+    find_file_docstring,
+    find_procedure_names,
+    find_procedures,
+)
 
 patch_loggers(get_logger)
 
+_collect_cache: Dict[Path, Tuple[int, int, str, VbaModuleInfo]] = {}
+"""
+The modification time, size and encoding of each collected file, and the module collected from it.
+Only the latest version of each file is kept.
+
+MkDocs gets a new handler for each build, so this cache is kept outside of the handler
+to survive rebuilds, e.g. when using `mkdocs serve`.
+"""
+
 
 class VbaHandler(BaseHandler):
     """
@@ -45,9 +62,30 @@ class VbaHandler(BaseHandler):
     The directory in which to look for VBA files.
     """
 
-    def __init__(self, *, base_dir: Path, **kwargs: Any) -> None:
+    encoding: str
+    """
+    The encoding of the VBA files.
+    """
+
+    _paths: Dict[str, Path]
+    """
+    The file path of each identifier that was collected.
+    """
+
+    _module_template: Optional[Template]
+    """
+    The compiled `module.html` template, loaded by the first call to `render`.
+    """
+
+    def __init__(
+        self, *, base_dir: Path, encoding: Optional[str] = None, **kwargs: Any
+    ) -> None:
         super().__init__(**kwargs)
         self.base_dir = base_dir
+        # The VBA editor exports modules in the preferred encoding of the system.
+        self.encoding = encoding or getpreferredencoding(False)
+        self._paths = {}
+        self._module_template = None
 
     domain: str = "vba"
     """
@@ -64,26 +102,29 @@ class VbaHandler(BaseHandler):
     The theme to fall back to.
     """
 
-    default_config = {
-        "show_root_heading": False,
-        "show_root_toc_entry": True,
-        "show_root_full_path": True,
-        "show_root_members_full_path": False,
-        "show_object_full_path": False,
-        "show_category_heading": False,
-        "show_if_no_docstring": False,
-        "show_signature": True,
-        "separate_signature": False,
-        "line_length": 60,
-        "show_source": True,
-        "show_bases": True,
-        "show_submodules": True,
-        "heading_level": 2,
-        "members_order": Order.alphabetical.value,
-        "docstring_section_style": "table",
-    }
+    default_config: Mapping[str, Any] = MappingProxyType(
+        {
+            "show_root_heading": False,
+            "show_root_toc_entry": True,
+            "show_root_full_path": True,
+            "show_root_members_full_path": False,
+            "show_object_full_path": False,
+            "show_category_heading": False,
+            "show_if_no_docstring": False,
+            "show_signature": True,
+            "separate_signature": False,
+            "line_length": 60,
+            "show_source": True,
+            "show_bases": True,
+            "show_submodules": True,
+            "heading_level": 2,
+            "members_order": Order.alphabetical,
+            "docstring_section_style": "table",
+        }
+    )
     """
     The default rendering options.
+    These are shared by all handler instances, so they are read-only.
 
     See [`default_config`][mkdocstrings_handlers.vba.renderer.VbaRenderer.default_config].
 
@@ -139,32 +180,35 @@ class VbaHandler(BaseHandler):
         data: VbaModuleInfo,
         config: Mapping[str, Any],
     ) -> str:
-        final_config = ChainMap(dict(copy.deepcopy(config)), self.default_config)
-        template = self.env.get_template(f"module.html")
+        final_config = {**self.default_config, **config}
+        template = self._module_template
+        if template is None:
+            template = self._module_template = self.env.get_template("module.html")
 
         # Heading level is a "state" variable, that will change at each step
         # of the rendering recursion. Therefore, it's easier to use it as a plain value
         # than as an item in a dictionary.
         heading_level = final_config["heading_level"]
-        try:
-            final_config["members_order"] = Order(final_config["members_order"])
-        except ValueError:
-            choices = "', '".join(item.value for item in Order)
-            raise PluginError(
-                f"Unknown members_order '{final_config['members_order']}', choose between '{choices}'."
-            )
+
+        # The default is already an `Order`, so only options given by the user need to be validated.
+        if not isinstance(final_config["members_order"], Order):
+            try:
+                final_config["members_order"] = Order(final_config["members_order"])
+            except ValueError:
+                choices = "', '".join(item.value for item in Order)
+                raise PluginError(
+                    f"Unknown members_order '{final_config['members_order']}', choose between '{choices}'."
+                )
 
         return template.render(
-            **{
-                "config": final_config,
-                "module": data,
-                "heading_level": heading_level,
-                "root": True,
-            },
+            config=final_config,
+            module=data,
+            heading_level=heading_level,
+            root=True,
         )
 
-    def get_anchors(self, data: VbaModuleInfo) -> Set[str]:
-        return {data.path.as_posix(), *(p.signature.name for p in data.procedures)}
+    def get_anchors(self, data: VbaModuleInfo) -> Tuple[str, ...]:
+        return data.anchors
 
     def update_env(self, md: Markdown, config: Dict[Any, Any]) -> None:
         super().update_env(md, config)
@@ -192,18 +236,53 @@ class VbaHandler(BaseHandler):
         Returns:
             The collected object tree.
         """
-        p = Path(self.base_dir, identifier)
-        with p.open("r") as f:
-            code = f.read()
-
-        code = collapse_long_lines(code)
+        identifier = sys.intern(identifier)
+        p = self._paths.get(identifier)
+        if p is None:
+            p = self._paths[identifier] = Path(self.base_dir, identifier)
 
-        return VbaModuleInfo(
-            docstring=find_file_docstring(code),
-            source=code.splitlines(),
+        # The collected module is treated as read-only by `render`,
+        # so it is safe to share it between callers until the file changes.
+        try:
+            st = p.stat()
+        except OSError as e:
+            raise CollectionError(f"Cannot read VBA file: {e}") from e
+        # The size also catches changes within the resolution of coarse modification times.
+        mtime_ns, size = st.st_mtime_ns, st.st_size
+        cached = _collect_cache.get(p)
+        if cached is not None and cached[:3] == (mtime_ns, size, self.encoding):
+            return cached[3]
+
+        # Decode the whole file at once, without the text-mode buffering of `Path.open("r")`.
+        try:
+            code = p.read_bytes().decode(self.encoding)
+        except OSError as e:
+            raise CollectionError(f"Cannot read VBA file: {e}") from e
+        except UnicodeDecodeError as e:
+            raise CollectionError(
+                f"Cannot decode VBA file {p} as {self.encoding}, set the handler's `encoding` option: {e}"
+            ) from e
+
+        # Collapsing the lines never adds or removes a comment marker.
+        has_comments = "'" in code
+        source = collapse_long_lines(code)
+
+        if has_comments:
+            docstring, body_start = find_file_docstring(source)
+        else:
+            # There are no comments, so there is no docstring.
+            docstring, body_start = Docstring(value="", lineno=None), 0
+
+        # The procedures can only start after the module docstring, so their search resumes there.
+        module = VbaModuleInfo(
+            docstring=docstring,
+            source=source,
             path=p,
-            procedures=list(find_procedures(code)),
+            find_procedures=partial(find_procedures, source, body_start),
+            find_procedure_names=partial(find_procedure_names, source, body_start),
         )
+        _collect_cache[p] = (mtime_ns, size, self.encoding, module)
+        return module
 
 
 def get_handler(
@@ -212,6 +291,7 @@ def get_handler(
     config_file_path: str | None = None,
     paths: list[str] | None = None,
     locale: str = "en",
+    encoding: str | None = None,
     **config: Any,
 ) -> VbaHandler:
     """
@@ -223,6 +303,8 @@ def get_handler(
         config_file_path: The MkDocs configuration file path.
         paths: A list of paths to use as Griffe search paths.
         locale: The locale to use when rendering content.
+        encoding: The encoding of the VBA files. Defaults to the preferred encoding of the system,
+            which is what the VBA editor uses when exporting modules.
         **config: Configuration passed to the handler.
 
     Returns:
@@ -230,6 +312,7 @@ def get_handler(
     """
     return VbaHandler(
         base_dir=Path(config_file_path or ".").parent,
+        encoding=encoding,
         handler="vba",
         theme=theme,
         custom_templates=custom_templates,
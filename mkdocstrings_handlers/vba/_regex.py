@@ -1,23 +1,77 @@
 import re
 
-re_arg = re.compile(
+_arg_head = (
     r"((?P<optional>Optional) +)?"
     r"((?P<modifier>ByVal|ByRef|ParamArray) +)?"
     r"(?P<name>[A-Z_][A-Z0-9_]*)"
     r"(\(\))?"
     r"( +As +(?P<type>[A-Z_][A-Z0-9_]*))?"
-    r"( *= *(?P<default>.*))?",
+    r"( *= *(?P<default>"
+)
+"""
+The start of the argument patterns, up to the default value. Shared so that they accept the same arguments.
+"""
+
+re_arg = re.compile(
+    _arg_head + r".*))?",
+    re.IGNORECASE,
+)
+
+re_arg_item = re.compile(
+    # Any whitespace around an argument is ignored, like `str.strip` does for a single argument.
+    r"\s*" + _arg_head
+    # Same as `.*` in `re_arg`, but stops at the separator, and leaves any trailing whitespace to `\s*`.
+    + r"[^,\n]*?))?\s*((?P<separator>,)|\Z)",
     re.IGNORECASE,
 )
+"""
+Like `re_arg`, but matches one argument in a comma-separated list, including the separator.
+"""
 
 re_signature = re.compile(
     r"((?P<visibility>Private|Public) +)?"
     r"(?P<type>Sub|Function|Property (Let|Get)) *"
-    r"(?P<name>[A-Z_][A-Z0-9_]*)\( *(?P<args>[^,]+( *, *[^,]+)*)? *\)"
+    # `[^,]+` already includes spaces, so the separator is only the comma.
+    # Allowing spaces around it as well makes the pattern backtrack exponentially on unmatched lines.
+    r"(?P<name>[A-Z_][A-Z0-9_]*)\( *(?P<args>[^,]+(,[^,]+)*)? *\)"
     r"( +As +(?P<returnType>[A-Z_][A-Z0-9_]*))?",
     re.IGNORECASE,
 )
 
+re_signature_line = re.compile(
+    # Starting with a literal newline, instead of `^` in multiline mode, lets the regex engine skip ahead quickly.
+    # The lookahead rejects most lines before trying the case-insensitive alternatives.
+    r"\n[^\S\n]*(?=[PpSsFf\u017f])"
+    r"(?P<signature>(?i:"
+    r"((Private|Public) +)?"
+    r"(Sub|Function|Property (Let|Get)) *"
+    r"[A-Z_][A-Z0-9_]*\( *([^,'\n]+(,[^,'\n]+)*)? *\)"
+    r"( +As +[A-Z_][A-Z0-9_]*)?"
+    r"))"
+    r"[^\S\n]*('[^\n]*)?(?=\n|\Z)"
+)
+"""
+Finds the lines that `re_signature` would match (after removing the comment),
+in code where every line, including the first, is preceded by a newline.
+"""
+
+re_end_line = re.compile(r"\n[Ee][Nn][Dd]")
+"""
+Finds the lines that end a procedure, in code where every line, including the first, is preceded by a newline.
+"""
+
+re_identifier = re.compile(r"[\w.]+")
+
+re_trailing_comment = re.compile(r"'.*$")
+
+re_comment_marker = re.compile(r"^( *)'", re.MULTILINE)
+
 if __name__ == "__main__":
     print(re_arg.pattern)
+    print(re_arg_item.pattern)
     print(re_signature.pattern)
+    print(re_signature_line.pattern)
+    print(re_end_line.pattern)
+    print(re_identifier.pattern)
+    print(re_trailing_comment.pattern)
+    print(re_comment_marker.pattern)
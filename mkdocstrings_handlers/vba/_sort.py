@@ -17,11 +17,13 @@ class Order(enum.Enum):
     source = "source"
 
 
+# A string that contains the final unicode character, so if 'name' isn't found
+# on the object, the item will go to the end of the list.
+_last_name = chr(sys.maxunicode)
+
+
 def _sort_key_alphabetical(item: CollectorItem) -> Any:
-    # chr(sys.maxunicode) is a string that contains the final unicode
-    # character, so if 'name' isn't found on the object, the item will go to
-    # the end of the list.
-    return item.name or chr(sys.maxunicode)
+    return item.name or _last_name
 
 
 def _sort_key_source(item: CollectorItem) -> Any:
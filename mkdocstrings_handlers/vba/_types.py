@@ -1,12 +1,15 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterable, List, Optional, Tuple
 
 from griffe.dataclasses import Docstring
 
 
-@dataclass
+@dataclass(frozen=True)
 class VbaArgumentInfo:
+    __slots__ = ("name", "optional", "modifier", "arg_type", "default")
+
     name: str
 
     optional: bool
@@ -31,8 +34,10 @@ class VbaArgumentInfo:
         return " ".join(parts)
 
 
-@dataclass
+@dataclass(frozen=True)
 class VbaSignatureInfo:
+    __slots__ = ("visibility", "return_type", "procedure_type", "name", "args")
+
     visibility: Optional[str]
     return_type: Optional[str]
     procedure_type: str
@@ -40,8 +45,10 @@ class VbaSignatureInfo:
     args: List[VbaArgumentInfo]
 
 
-@dataclass
+@dataclass(frozen=True, repr=False, eq=False)
 class VbaProcedureInfo:
+    __slots__ = ("signature", "docstring", "first_line", "last_line", "module_source")
+
     signature: VbaSignatureInfo
 
     docstring: Optional[Docstring]
@@ -56,12 +63,45 @@ class VbaProcedureInfo:
     1-indexed
     """
 
-    source: List[str]
+    module_source: List[str]
+    """
+    The lines of the whole module, shared by all of its procedures.
+    """
+
+    @property
+    def source(self) -> List[str]:
+        """
+        The lines of the procedure, from the signature up to the `End` line (excluded).
+        """
+        return self.module_source[self.first_line - 1 : self.last_line - 1]
 
     @property
     def has_docstrings(self) -> bool:
         return self.docstring is not None
 
+    # `repr` and `==` use the procedure's own source instead of `module_source`,
+    # which would show or compare the whole module.
+
+    def _key(self) -> Tuple[VbaSignatureInfo, Optional[Docstring], int, int, List[str]]:
+        return (
+            self.signature,
+            self.docstring,
+            self.first_line,
+            self.last_line,
+            self.source,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(signature={self.signature!r}, docstring={self.docstring!r}, "
+            f"first_line={self.first_line!r}, last_line={self.last_line!r}, source={self.source!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VbaProcedureInfo):
+            return NotImplemented
+        return self._key() == other._key()
+
 
 @dataclass
 class VbaModuleInfo:
@@ -71,7 +111,45 @@ class VbaModuleInfo:
 
     path: Path
 
-    procedures: List[VbaProcedureInfo]
+    find_procedures: Callable[[], Iterable[VbaProcedureInfo]] = field(
+        repr=False, compare=False
+    )
+    """
+    Finds the procedures in this module. Only called when they are first needed.
+    """
+
+    find_procedure_names: Callable[[], Iterable[str]] = field(repr=False, compare=False)
+    """
+    Finds the names of the procedures in this module, without parsing the procedures themselves.
+    """
+
+    @cached_property
+    def procedures(self) -> Tuple[VbaProcedureInfo, ...]:
+        """
+        The procedures in this module, only parsed when first needed.
+        """
+        return tuple(self.find_procedures())
+
+    @cached_property
+    def procedure_names(self) -> Tuple[str, ...]:
+        """
+        The names of the procedures in this module.
+
+        This does not parse the procedures themselves, unless that was already done.
+        """
+        if "procedures" in self.__dict__:
+            return tuple(p.signature.name for p in self.procedures)
+
+        return tuple(self.find_procedure_names())
+
+    @cached_property
+    def anchors(self) -> Tuple[str, ...]:
+        """
+        The HTML anchors of this module and its procedures.
+
+        Deduplicated (e.g. `Property Get` and `Property Let` share a name), but in order.
+        """
+        return tuple(dict.fromkeys((self.name, *self.procedure_names)))
 
     @property
     def has_docstrings(self) -> bool:
@@ -1,10 +1,20 @@
-import re
-from typing import List, Generator
+import sys
+from functools import lru_cache
+from itertools import islice
+from typing import List, Generator, Optional, Tuple
 
 from griffe.dataclasses import Docstring, Function, Parameters, Parameter
 from griffe.docstrings import Parser
 
-from ._regex import re_signature, re_arg
+from ._regex import (
+    re_signature,
+    re_signature_line,
+    re_end_line,
+    re_arg,
+    re_arg_item,
+    re_trailing_comment,
+    re_comment_marker,
+)
 from ._types import (
     VbaArgumentInfo,
     VbaSignatureInfo,
@@ -30,32 +40,50 @@ def is_signature(line: str) -> bool:
         >>> is_signature("' This is the file docstring")
         False
     """
-    try:
-        parse_signature(line)
-    except RuntimeError:
-        return False
-
-    return True
+    return try_parse_signature(line) is not None
 
 
 def is_comment(line: str) -> bool:
-    return re.match(r"^ *'", line, re.IGNORECASE) is not None
+    """
+    Check if the given line is a comment, optionally indented with spaces.
+
+    Examples:
+        >>> is_comment("    ' This is a comment")
+        True
+        >>> is_comment("x = 1 ' This is a trailing comment")
+        False
+    """
+    return line.lstrip(" ").startswith("'")
+
 
+def uncomment(lines: List[str]) -> str:
+    """
+    Join the given comment lines, and remove the comment character from each of them.
 
-def uncomment_lines(lines: List[str]) -> List[str]:
-    return [line.replace("'", "", 1) for line in lines]
+    Examples:
+        >>> print(uncomment(["' Foo", "    '   bar 'baz'"]))
+         Foo
+               bar 'baz'
+    """
+    return re_comment_marker.sub(r"\1", "\n".join(lines), count=len(lines))
 
 
-def find_file_docstring(code: str) -> Docstring:
+def find_file_docstring(lines: List[str]) -> Tuple[Docstring, int]:
     """
-    Find the file docstring in the given VBA code.
+    Find the file docstring in the given lines of VBA code.
     It's the first block of comment lines before the first signature, if any.
+
+    Returns:
+        The docstring, and the index of the first signature line (or the number of lines if there is none).
+        Procedures can only start from there, so the search for them can resume at that line.
     """
     docstring_lines = []
     lineno = None
+    end = len(lines)
 
-    for i, line in enumerate(code.splitlines()):
+    for i, line in enumerate(lines):
         if is_signature(line):
+            end = i
             break
         if is_comment(line):
             if lineno is None:
@@ -64,148 +92,352 @@ def find_file_docstring(code: str) -> Docstring:
 
             docstring_lines.append(line)
 
-    docstring_value = "\n".join(uncomment_lines(docstring_lines))
+    docstring_value = uncomment(docstring_lines)
 
-    return Docstring(
+    docstring = Docstring(
         value=docstring_value,
         lineno=lineno,
     )
+    return docstring, end
 
 
-def is_end(line: str) -> bool:
-    return line.casefold().startswith("end")
-
-
-def parse_args(args: str) -> Generator[VbaArgumentInfo, None, None]:
+def parse_args(args: str) -> List[VbaArgumentInfo]:
     """
     Parse the arguments portion of a signature line of a VBA procedure.
+
+    Each argument is matched in place, instead of splitting the string and matching each part separately.
     """
     args = args.strip()
+    result: List[VbaArgumentInfo] = []
     if not len(args):
-        return
+        return result
+
+    pos = 0
+    while True:
+        match = re_arg_item.match(args, pos)
+        if match is None:
+            raise argument_error(args[pos:].split(",", 1)[0].strip())
+
+        result.append(
+            VbaArgumentInfo(
+                optional=bool(match["optional"]),
+                modifier=match["modifier"],
+                name=match["name"],
+                arg_type=match["type"],
+                default=match["default"],
+            )
+        )
 
-    for arg in args.split(","):
-        yield parse_arg(arg)
+        if match["separator"] is None:
+            return result
+        pos = match.end()
 
 
-def parse_arg(arg: str) -> VbaArgumentInfo:
-    arg = arg.strip()
+def argument_error(arg: str) -> Exception:
+    """
+    The error for an argument (without surrounding whitespace) that `re_arg` does not match.
+    """
     if not len(arg):
-        raise NotImplementedError(
+        return NotImplementedError(
             "What do we do with empty arguments in a function signature?"
         )
+    return RuntimeError(f"Failed to parse argument: {arg}")
+
 
-    match = re_arg.fullmatch(arg)
+def parse_arg(arg: str) -> VbaArgumentInfo:
+    arg = arg.strip()
+    match = re_arg.fullmatch(arg) if len(arg) else None
 
     if match is None:
-        raise RuntimeError(f"Failed to parse argument: {arg}")
-    groups = match.groupdict()
+        raise argument_error(arg)
 
     return VbaArgumentInfo(
-        optional=bool(groups["optional"]),
-        modifier=groups["modifier"],
-        name=groups["name"],
-        arg_type=groups["type"],
-        default=groups["default"],
+        optional=bool(match["optional"]),
+        modifier=match["modifier"],
+        name=match["name"],
+        arg_type=match["type"],
+        default=match["default"],
     )
 
 
-def parse_signature(line: str) -> VbaSignatureInfo:
+signature_keywords = ("sub", "function", "property", "private", "public")
+"""
+The keywords that a signature line can start with, casefolded.
+"""
+
+
+def starts_with_signature_keyword(line: str) -> bool:
     """
-    Parse the signature line of a VBA procedure.
+    Cheaply check if the given line could be a signature, by looking at the first keyword only.
+
+    Examples:
+        >>> starts_with_signature_keyword("  Private Sub foo()")
+        True
+        >>> starts_with_signature_keyword("    If x Then")
+        False
+    """
+    head = line.lstrip()[:8]
+    if not head.isascii():
+        # `re.IGNORECASE` matches some non-ASCII characters (like the dotless i) that `casefold` does not map.
+        return True
+    return head.casefold().startswith(signature_keywords)
+
+
+def try_parse_signature(line: str) -> Optional[VbaSignatureInfo]:
+    """
+    Parse the signature line of a VBA procedure, or return `None` if the line is not a signature.
+
+    Examples:
+        >>> try_parse_signature("Private Sub foo(a, b) ' Comment").name
+        'foo'
+        >>> try_parse_signature("    If x Then") is None
+        True
+        >>> try_parse_signature("Sub foo(a, b c)") is None
+        True
+    """
+    if not starts_with_signature_keyword(line):
+        # Most lines are not signatures, so avoid running the regexes on them, and keep them out of the cache.
+        return None
+
+    parts = parse_signature_parts(line)
+    if parts is None:
+        return None
+
+    visibility, return_type, procedure_type, name, args = parts
+    return VbaSignatureInfo(
+        visibility=visibility,
+        return_type=return_type,
+        procedure_type=procedure_type,
+        name=name,
+        # The cached arguments are shared, so every signature gets a list of its own.
+        args=list(args),
+    )
+
+
+SignatureParts = Tuple[
+    Optional[str], Optional[str], str, str, Tuple[VbaArgumentInfo, ...]
+]
+"""
+The visibility, return type, procedure type, name and arguments of a signature.
+"""
+
+
+@lru_cache(maxsize=4096)
+def parse_signature_parts(line: str) -> Optional[SignatureParts]:
     """
-    line = re.sub(r"'.*$", "", line).strip()  # Strip comment and whitespace.
+    Parse a line that starts with a signature keyword, or return `None` if the line is not a signature.
+
+    Signatures like `Private Sub Class_Initialize()` recur across modules, so the results are cached.
+    They are immutable, so they can be shared.
+    """
+    if "'" in line:
+        line = re_trailing_comment.sub("", line)  # Strip comment.
+    line = line.strip()
 
     match = re_signature.fullmatch(line)
 
     if match is None:
-        raise RuntimeError(f"Failed to parse signature: {line}")
-    groups = match.groupdict()
+        return None
 
-    return VbaSignatureInfo(
-        visibility=groups["visibility"],
-        return_type=groups["returnType"],
-        procedure_type=groups["type"],
-        name=groups["name"],
-        args=list(parse_args(groups["args"] or "")),
+    try:
+        args = parse_args(match["args"] or "")
+    except RuntimeError:
+        return None
+
+    return (
+        match["visibility"],
+        match["returnType"],
+        match["type"],
+        # Names like `Class_Initialize` recur across modules, and they are used as anchors.
+        sys.intern(match["name"]),
+        tuple(args),
     )
 
 
-def find_procedures(code: str) -> Generator[VbaProcedureInfo, None, None]:
-    lines = code.splitlines()
-    procedure = None
+def parse_signature(line: str) -> VbaSignatureInfo:
+    """
+    Parse the signature line of a VBA procedure.
+
+    Raises:
+        RuntimeError: If the line is not a signature.
+    """
+    signature = try_parse_signature(line)
+    if signature is None:
+        raise RuntimeError(f"Failed to parse signature: {line.strip()}")
+    return signature
 
-    for i, line in enumerate(lines):
-        if procedure is None:
-            # Looking for signature. Ignore everything until we find one.
-            if not is_signature(line):
-                continue
-
-            procedure = {
-                "signature": parse_signature(line),
-                "first_line": i + 1,
-            }
+
+def scan_procedures(
+    lines: List[str], start: int = 0
+) -> Generator[Tuple[VbaSignatureInfo, int, int], None, None]:
+    """
+    Find the signature and the first and last line index of each procedure in the given lines of VBA code,
+    starting at the line with index `start`.
+
+    Instead of trying to parse every line, this searches the joined lines for signature lines and `End` lines,
+    so that only the lines that matter are visited in Python.
+
+    Examples:
+        >>> [(s.name, first, last) for s, first, last in scan_procedures([
+        ...     "Option Explicit",
+        ...     "Sub foo() ' Comment",
+        ...     "    Sub bar()",
+        ...     "End Sub",
+        ...     "Sub baz()",
+        ... ])]
+        [('foo', 1, 3)]
+    """
+    # Every line boundary in the joined code is a newline, because the lines came from `splitlines`.
+    # Each line is preceded by a newline, so the index of a line is the number of newlines before its own.
+    code = "\n" + "\n".join(islice(lines, start, None))
+
+    pos = 0
+    line_index = start - 1
+    line_pos = 0
+
+    while True:
+        match = re_signature_line.search(code, pos)
+        if match is None:
+            return
+
+        line_index += code.count("\n", line_pos, match.start() + 1)
+        line_pos = match.start() + 1
+        pos = match.end()
+        signature = try_parse_signature(match.group("signature"))
+        if signature is None:
+            # The arguments could not be parsed, so this is not a signature.
             continue
 
-        if is_end(line):
-            # Found the end of a procedure.
-            procedure["last_line"] = i + 1
-
-            # The docstring consists of the comment lines directly after the signature.
-            docstring_lines = []
-            procedure_source = lines[
-                procedure["first_line"] - 1 : procedure["last_line"] - 1
-            ]
-            for source_line in procedure_source[1:]:
-                if not is_comment(source_line):
-                    break
-                docstring_lines.append(source_line)
-
-            docstring_value = "\n".join(uncomment_lines(docstring_lines))
-
-            # See https://mkdocstrings.github.io/griffe/usage/#using-griffe-as-a-docstring-parsing-library
-            docstring = Docstring(
-                value=docstring_value,
-                parser=Parser.google,
-                parser_options={},
-                lineno=procedure["first_line"] + 1,
-                parent=Function(
-                    name=procedure["signature"].name,
-                    parameters=Parameters(
-                        *(
-                            Parameter(
-                                name=arg.name,
-                                annotation=arg.arg_type,
-                                default=arg.default,
-                            )
-                            for arg in procedure["signature"].args
+        end = re_end_line.search(code, pos)
+        if end is None:
+            # The procedure never ends.
+            return
+
+        first_line_index = line_index
+        line_index += code.count("\n", line_pos, end.start() + 1)
+        line_pos = end.start() + 1
+        pos = end.end()
+
+        yield signature, first_line_index, line_index
+
+
+def find_procedures(
+    lines: List[str], start: int = 0
+) -> Generator[VbaProcedureInfo, None, None]:
+    """
+    Find the procedures in the given lines of VBA code, starting at the line with index `start`.
+    """
+    for signature, first, last in scan_procedures(lines, start):
+        # The docstring consists of the comment lines directly after the signature.
+        docstring_lines = []
+        for line in islice(lines, first + 1, last):
+            if not is_comment(line):
+                break
+            docstring_lines.append(line)
+
+        docstring_value = uncomment(docstring_lines)
+
+        # The parent is only used to look up the parameters while parsing the docstring sections,
+        # so it is not needed for procedures without a docstring.
+        parent = (
+            Function(
+                name=signature.name,
+                parameters=Parameters(
+                    *(
+                        Parameter(
+                            name=arg.name,
+                            annotation=arg.arg_type,
+                            default=arg.default,
                         )
-                    ),
+                        for arg in signature.args
+                    )
                 ),
             )
+            if docstring_value
+            else None
+        )
 
-            # Yield it and start over.
-            yield VbaProcedureInfo(
-                signature=procedure["signature"],
-                docstring=docstring,
-                first_line=procedure["first_line"],
-                last_line=procedure["last_line"],
-                source=procedure_source,
-            )
-            procedure = None
+        # See https://mkdocstrings.github.io/griffe/usage/#using-griffe-as-a-docstring-parsing-library
+        docstring = Docstring(
+            value=docstring_value,
+            parser=Parser.google,
+            parser_options={},
+            lineno=first + 2,
+            parent=parent,
+        )
+
+        yield VbaProcedureInfo(
+            signature=signature,
+            docstring=docstring,
+            first_line=first + 1,
+            last_line=last + 1,
+            module_source=lines,
+        )
 
 
-def collapse_long_lines(code: str) -> str:
+def find_procedure_names(
+    lines: List[str], start: int = 0
+) -> Generator[str, None, None]:
+    """
+    Find the names of the procedures in the given lines of VBA code, starting at the line with index `start`.
+
+    This is a cheaper alternative to `find_procedures` for when only the names are needed,
+    because it does not extract the source and docstring of each procedure.
+    """
+    for signature, _, _ in scan_procedures(lines, start):
+        yield signature.name
+
+
+def collapse_long_lines(code: str) -> List[str]:
     """
     Collapse lines that are split by continuation characters (underscore).
 
+    The lines are collapsed and collected in a single pass,
+    so that the caller does not need to split the collapsed code into lines.
+
+    Returns:
+        The lines of the code, after collapsing.
+
     Examples:
         >>> collapse_long_lines('''hello _
         ... world''')
-        'hello world'
+        ['hello world']
         >>> collapse_long_lines('''hello _ world''')
-        'hello _ world'
+        ['hello _ world']
         >>> collapse_long_lines('hello _  \\nworld')
-        'hello world'
+        ['hello world']
+        >>> collapse_long_lines('a _\\r\\nb _\\r\\nc\\r\\nd')
+        ['a b c', 'd']
+        >>> collapse_long_lines('a\\r\\nb')
+        ['a', 'b']
+
+        A continuation character before the final line break is dropped,
+        but one on an unterminated last line is kept, with the line as it is:
+
+        >>> collapse_long_lines("' doc _\\n")
+        ["' doc "]
+        >>> collapse_long_lines('Sub foo() _ ')
+        ['Sub foo() _ ']
     """
-    return re.sub(r" _\s*?(\r|\n|\r\n)", " ", code)
+    if " _" not in code:
+        # Most modules have no continuation lines at all.
+        return code.splitlines()
+
+    lines = []
+    previous = continued = line = ""
+
+    for line in code.splitlines():
+        stripped = line.rstrip()
+        if stripped.endswith(" _"):
+            # Keep the space before the underscore, drop the underscore itself.
+            previous, continued = continued, continued + stripped[:-1]
+            continue
+
+        lines.append(continued + line)
+        continued = ""
+
+    if continued:
+        # The last line has nothing to continue onto.
+        lines.append(continued if code.endswith(("\r", "\n")) else previous + line)
+
+    return lines
@@ -0,0 +1,38 @@
+import unittest
+
+from markupsafe import Markup
+
+# noinspection PyProtectedMember
+from mkdocstrings_handlers.vba._crossref import do_crossref
+
+
+class TestDoCrossref(unittest.TestCase):
+    def test_cache_keeps_markup_and_str_apart(self) -> None:
+        """
+        A cached result for a `str` path is not returned for a `Markup` path with the same text, and vice versa.
+        """
+        escaped = Markup(
+            "<span data-autorefs-optional-hover=a.&lt;b&gt;>&lt;b&gt;</span>"
+        )
+        unescaped = Markup("<span data-autorefs-optional-hover=a.<b>><b></span>")
+        cases = [
+            ("str first", ["a.<b>", Markup("a.<b>")], [escaped, unescaped]),
+            ("Markup first", [Markup("a.<b>"), "a.<b>"], [unescaped, escaped]),
+        ]
+
+        for description, paths, results in cases:
+            with self.subTest(description):
+                do_crossref.cache_clear()
+                # Passing a keyword argument makes `str` and `Markup` keys equal, unless the cache is typed.
+                self.assertEqual(
+                    results, [do_crossref(path, brief=True) for path in paths]
+                )
+                self.assertEqual(
+                    results, [do_crossref(path, brief=True) for path in paths]
+                )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        failfast=True,
+    )
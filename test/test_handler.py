@@ -0,0 +1,160 @@
+import unittest
+from locale import getpreferredencoding
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from markdown import Markdown
+from mkdocstrings.handlers.base import CollectionError
+
+from mkdocstrings_handlers.vba import get_handler
+
+# noinspection PyProtectedMember
+from mkdocstrings_handlers.vba._handler import VbaHandler, _collect_cache
+
+
+def make_handler(base_dir: Path, encoding: str = "utf-8") -> VbaHandler:
+    return VbaHandler(
+        base_dir=base_dir,
+        encoding=encoding,
+        handler="vba",
+        theme="material",
+    )
+
+
+@patch.dict(_collect_cache, clear=True)
+class TestCollect(unittest.TestCase):
+    def test_cache(self) -> None:
+        """
+        An unchanged file is collected once. A changed file is collected again, and replaces the old module.
+        """
+        with TemporaryDirectory() as tmp_dir_str:
+            tmp_dir = Path(tmp_dir_str)
+            path = tmp_dir.joinpath("Module1.bas")
+            handler = make_handler(tmp_dir)
+
+            path.write_text("Sub foo()\nEnd Sub\n")
+            module = handler.collect("Module1.bas", {})
+            self.assertEqual(("foo",), module.procedure_names)
+            self.assertIs(module, handler.collect("Module1.bas", {}))
+
+            path.write_text("Sub foobar()\nEnd Sub\n")
+            module = handler.collect("Module1.bas", {})
+            self.assertEqual(("foobar",), module.procedure_names)
+            self.assertEqual(1, len(_collect_cache))
+
+    def test_procedures(self) -> None:
+        """
+        The procedures are found after the module docstring, whether or not the names were found first.
+        """
+        with TemporaryDirectory() as tmp_dir_str:
+            tmp_dir = Path(tmp_dir_str)
+            tmp_dir.joinpath("Module1.bas").write_text(
+                "' Module docstring\nOption Explicit\nSub foo()\nEnd Sub\n"
+            )
+            tmp_dir.joinpath("Module2.bas").write_text("Option Explicit\n")
+            handler = make_handler(tmp_dir)
+
+            module = handler.collect("Module1.bas", {})
+            self.assertEqual(("foo",), module.procedure_names)
+            self.assertEqual([3], [p.first_line for p in module.procedures])
+            self.assertEqual((module.name, "foo"), module.anchors)
+
+            module = handler.collect("Module2.bas", {})
+            self.assertEqual((), module.procedures)
+            self.assertEqual((module.name,), module.anchors)
+
+
+@patch.dict(_collect_cache, clear=True)
+class TestEncoding(unittest.TestCase):
+    def test_default(self) -> None:
+        handler = VbaHandler(base_dir=Path("."), handler="vba", theme="material")
+        self.assertEqual(getpreferredencoding(False), handler.encoding)
+
+    def test_cp1252(self) -> None:
+        with TemporaryDirectory() as tmp_dir_str:
+            tmp_dir = Path(tmp_dir_str)
+            tmp_dir.joinpath("Module1.bas").write_bytes(
+                "' Grüße\r\nSub foo()\r\nEnd Sub\r\n".encode("cp1252")
+            )
+            handler = make_handler(tmp_dir, encoding="cp1252")
+
+            module = handler.collect("Module1.bas", {})
+            assert module.docstring is not None
+            self.assertEqual("Grüße", module.docstring.value)
+            self.assertEqual(("foo",), module.procedure_names)
+
+    def test_wrong_encoding(self) -> None:
+        with TemporaryDirectory() as tmp_dir_str:
+            tmp_dir = Path(tmp_dir_str)
+            tmp_dir.joinpath("Module1.bas").write_bytes("' Grüße\r\n".encode("cp1252"))
+            handler = make_handler(tmp_dir, encoding="utf-8")
+
+            with self.assertRaisesRegex(CollectionError, "encoding"):
+                handler.collect("Module1.bas", {})
+
+    def test_missing_file(self) -> None:
+        with TemporaryDirectory() as tmp_dir_str:
+            handler = make_handler(Path(tmp_dir_str))
+
+            with self.assertRaises(CollectionError):
+                handler.collect("Missing.bas", {})
+
+
+@patch.dict(_collect_cache, clear=True)
+class TestGetHandler(unittest.TestCase):
+    def test_collect_cache(self) -> None:
+        """
+        Each call returns a new handler, but the collected modules are shared between them.
+        """
+        with TemporaryDirectory() as tmp_dir_str:
+            tmp_dir = Path(tmp_dir_str)
+            tmp_dir.joinpath("Module1.bas").write_text("Sub foo()\nEnd Sub\n")
+            config_file_path = str(tmp_dir.joinpath("mkdocs.yml"))
+
+            handler = get_handler(theme="material", config_file_path=config_file_path)
+            other = get_handler(theme="material", config_file_path=config_file_path)
+            self.assertIsNot(handler, other)
+            self.assertIs(
+                handler.collect("Module1.bas", {}),
+                other.collect("Module1.bas", {}),
+            )
+
+            # A module decoded with another encoding is not reused.
+            cp1252 = get_handler(
+                theme="material",
+                config_file_path=config_file_path,
+                encoding="cp1252",
+            )
+            self.assertIsNot(
+                handler.collect("Module1.bas", {}),
+                cp1252.collect("Module1.bas", {}),
+            )
+
+    def test_custom_templates(self) -> None:
+        """
+        A custom template that is edited between builds is rendered again.
+        """
+        with TemporaryDirectory() as tmp_dir_str:
+            tmp_dir = Path(tmp_dir_str)
+            tmp_dir.joinpath("Module1.bas").write_text("Sub foo()\nEnd Sub\n")
+            template = tmp_dir.joinpath("templates", "vba", "material", "module.html")
+            template.parent.mkdir(parents=True)
+
+            for version in ("VERSION1", "VERSION2"):
+                with self.subTest(version):
+                    template.write_text(version)
+                    handler = get_handler(
+                        theme="material",
+                        custom_templates=str(tmp_dir.joinpath("templates")),
+                        config_file_path=str(tmp_dir.joinpath("mkdocs.yml")),
+                    )
+                    handler.update_env(Markdown(), {})
+                    module = handler.collect("Module1.bas", {})
+                    self.assertEqual(version, handler.render(module, {}))
+
+
+if __name__ == "__main__":
+    unittest.main(
+        failfast=True,
+    )
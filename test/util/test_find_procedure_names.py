@@ -0,0 +1,73 @@
+import unittest
+from typing import List, Tuple
+
+from locate import this_dir
+
+# noinspection PyProtectedMember
+from mkdocstrings_handlers.vba._util import (
+    collapse_long_lines,
+    find_file_docstring,
+    find_procedure_names,
+    find_procedures,
+)
+
+repo_dir = this_dir().parent.parent
+examples_dir = repo_dir.joinpath("examples")
+
+
+class TestFindProcedureNames(unittest.TestCase):
+    def test_1(self) -> None:
+        cases: List[Tuple[List[str], List[str]]] = [
+            ([], []),
+            (["Option Explicit"], []),
+            (["Sub foo()", "End Sub"], ["foo"]),
+            (["Sub foo()"], []),
+            (
+                [
+                    "Public Property Get asdf() As Variant",
+                    "End Property",
+                    "Public Property Let asdf(ByVal vNewValue As Variant)",
+                    "End Property",
+                ],
+                ["asdf", "asdf"],
+            ),
+        ]
+
+        for lines, result in cases:
+            with self.subTest(lines):
+                self.assertEqual(result, list(find_procedure_names(lines)))
+
+    def test_examples(self) -> None:
+        """
+        The names must match those of the fully parsed procedures.
+        """
+        for path in examples_dir.rglob("*.bas"):
+            with self.subTest(path.name):
+                lines = collapse_long_lines(path.read_text())
+                self.assertEqual(
+                    [p.signature.name for p in find_procedures(lines)],
+                    list(find_procedure_names(lines)),
+                )
+
+    def test_resume_after_file_docstring(self) -> None:
+        """
+        Resuming after the file docstring must find the same procedures as starting at the top.
+        """
+        for path in examples_dir.rglob("*.bas"):
+            with self.subTest(path.name):
+                lines = collapse_long_lines(path.read_text())
+                _, body_start = find_file_docstring(lines)
+                self.assertEqual(
+                    list(find_procedure_names(lines)),
+                    list(find_procedure_names(lines, body_start)),
+                )
+                self.assertEqual(
+                    [p.first_line for p in find_procedures(lines)],
+                    [p.first_line for p in find_procedures(lines, body_start)],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        failfast=True,
+    )
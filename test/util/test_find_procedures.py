@@ -0,0 +1,189 @@
+import unittest
+from typing import List, Optional, Tuple
+
+# noinspection PyProtectedMember
+from mkdocstrings_handlers.vba._types import VbaProcedureInfo
+
+# noinspection PyProtectedMember
+from mkdocstrings_handlers.vba._util import find_file_docstring, find_procedures
+
+Summary = Tuple[str, int, int, str, Optional[int], List[str]]
+
+
+def summarize(procedure: VbaProcedureInfo) -> Summary:
+    """
+    The name, first and last line, docstring value and line number, and source of the procedure.
+    """
+    assert procedure.docstring is not None
+    return (
+        procedure.signature.name,
+        procedure.first_line,
+        procedure.last_line,
+        procedure.docstring.value,
+        procedure.docstring.lineno,
+        procedure.source,
+    )
+
+
+class TestFindProcedures(unittest.TestCase):
+    def test_1(self) -> None:
+        cases: List[Tuple[str, List[str], List[Summary]]] = [
+            (
+                "docstring",
+                [
+                    "Option Explicit",
+                    "Function foo(a) As Long",
+                    "    ' Foo.",
+                    "    '",
+                    "    ' Args:",
+                    "    '     a: A.",
+                    "    foo = a",
+                    "End Function",
+                ],
+                [
+                    (
+                        "foo",
+                        2,
+                        8,
+                        "Foo.\n\nArgs:\n    a: A.",
+                        3,
+                        [
+                            "Function foo(a) As Long",
+                            "    ' Foo.",
+                            "    '",
+                            "    ' Args:",
+                            "    '     a: A.",
+                            "    foo = a",
+                        ],
+                    ),
+                ],
+            ),
+            (
+                "nested signature before End",
+                [
+                    "Sub foo()",
+                    "    ' Foo.",
+                    "Sub bar()",
+                    "End Sub",
+                    "End Sub",
+                ],
+                [
+                    ("foo", 1, 4, "Foo.", 2, ["Sub foo()", "    ' Foo.", "Sub bar()"]),
+                ],
+            ),
+            (
+                "indented End",
+                [
+                    "Sub foo()",
+                    "    If x Then",
+                    "    End If",
+                    "End Sub",
+                ],
+                [
+                    (
+                        "foo",
+                        1,
+                        4,
+                        "",
+                        2,
+                        ["Sub foo()", "    If x Then", "    End If"],
+                    ),
+                ],
+            ),
+            (
+                "EndX",
+                [
+                    "Sub foo()",
+                    "EndX",
+                    "End Sub",
+                ],
+                [
+                    ("foo", 1, 2, "", 2, ["Sub foo()"]),
+                ],
+            ),
+            (
+                "trailing comment",
+                [
+                    "Private Sub foo(a) ' Not a docstring.",
+                    "End Sub",
+                ],
+                [
+                    ("foo", 1, 2, "", 2, ["Private Sub foo(a) ' Not a docstring."]),
+                ],
+            ),
+            (
+                "missing End",
+                [
+                    "Sub foo()",
+                    "    ' Foo.",
+                ],
+                [],
+            ),
+            (
+                "arguments fail to parse",
+                [
+                    "Sub foo(a b)",
+                    "End Sub",
+                    "Sub bar()",
+                    "End Sub",
+                ],
+                [
+                    ("bar", 3, 4, "", 4, ["Sub bar()"]),
+                ],
+            ),
+        ]
+
+        for description, lines, result in cases:
+            with self.subTest(description):
+                self.assertEqual(result, [summarize(p) for p in find_procedures(lines)])
+
+    def test_resume_after_file_docstring(self) -> None:
+        lines = [
+            "' Module docstring.",
+            "Option Explicit",
+            "",
+            "Sub foo()",
+            "    ' Foo.",
+            "End Sub",
+            "",
+            "Sub bar()",
+            "End Sub",
+        ]
+        docstring, body_start = find_file_docstring(lines)
+        self.assertEqual("Module docstring.", docstring.value)
+        self.assertEqual(3, body_start)
+        self.assertEqual(
+            [
+                ("foo", 4, 6, "Foo.", 5, ["Sub foo()", "    ' Foo."]),
+                ("bar", 8, 9, "", 9, ["Sub bar()"]),
+            ],
+            [summarize(p) for p in find_procedures(lines, body_start)],
+        )
+
+
+class TestVbaProcedureInfo(unittest.TestCase):
+    def test_module_source_is_left_out(self) -> None:
+        """
+        The lines of the module outside the procedure are not part of its `repr`, nor of its equality.
+        """
+        procedure = next(find_procedures(["Sub foo()", "End Sub", "' Other line"]))
+
+        def with_module_source(module_source: List[str]) -> VbaProcedureInfo:
+            return VbaProcedureInfo(
+                signature=procedure.signature,
+                docstring=procedure.docstring,
+                first_line=procedure.first_line,
+                last_line=procedure.last_line,
+                module_source=module_source,
+            )
+
+        self.assertNotIn("Other line", repr(procedure))
+        self.assertIn("Sub foo()", repr(procedure))
+        self.assertEqual(procedure, with_module_source(["Sub foo()", "End Sub"]))
+        self.assertNotEqual(procedure, with_module_source(["Sub bar()", "End Sub"]))
+
+
+if __name__ == "__main__":
+    unittest.main(
+        failfast=True,
+    )
@@ -73,6 +73,44 @@ class TestParseArgs(unittest.TestCase):
                     )
                 ],
             ),
+            (
+                "a,\tb",
+                [
+                    VbaArgumentInfo(
+                        name="a",
+                        optional=False,
+                        modifier=None,
+                        arg_type=None,
+                        default=None,
+                    ),
+                    VbaArgumentInfo(
+                        name="b",
+                        optional=False,
+                        modifier=None,
+                        arg_type=None,
+                        default=None,
+                    ),
+                ],
+            ),
+            (
+                "a\t, b",
+                [
+                    VbaArgumentInfo(
+                        name="a",
+                        optional=False,
+                        modifier=None,
+                        arg_type=None,
+                        default=None,
+                    ),
+                    VbaArgumentInfo(
+                        name="b",
+                        optional=False,
+                        modifier=None,
+                        arg_type=None,
+                        default=None,
+                    ),
+                ],
+            ),
             (
                 "a,b,c",
                 [
@@ -99,11 +137,42 @@ class TestParseArgs(unittest.TestCase):
                     ),
                 ],
             ),
+            (
+                ' ByVal n As Long = 1 , Optional s As String = "a b" ',
+                [
+                    VbaArgumentInfo(
+                        name="n",
+                        optional=False,
+                        modifier="ByVal",
+                        arg_type="Long",
+                        default="1",
+                    ),
+                    VbaArgumentInfo(
+                        name="s",
+                        optional=True,
+                        modifier=None,
+                        arg_type="String",
+                        default='"a b"',
+                    ),
+                ],
+            ),
         ]
 
         for args_string, result in cases:
             with self.subTest(args_string):
-                self.assertEqual(result, list(parse_args(args_string)))
+                self.assertEqual(result, parse_args(args_string))
+
+    def test_errors(self) -> None:
+        cases = [
+            ("a, b c", RuntimeError),
+            ("a,", NotImplementedError),
+            ("a,,b", NotImplementedError),
+        ]
+
+        for args_string, error in cases:
+            with self.subTest(args_string):
+                with self.assertRaises(error):
+                    parse_args(args_string)
 
 
 if __name__ == "__main__":
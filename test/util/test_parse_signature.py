@@ -4,7 +4,11 @@ import unittest
 from mkdocstrings_handlers.vba._types import VbaSignatureInfo, VbaArgumentInfo
 
 # noinspection PyProtectedMember
-from mkdocstrings_handlers.vba._util import parse_signature
+from mkdocstrings_handlers.vba._util import (
+    is_signature,
+    parse_signature,
+    parse_signature_parts,
+)
 
 
 class TestParseSignature(unittest.TestCase):
@@ -98,6 +102,30 @@ class TestParseSignature(unittest.TestCase):
             with self.subTest(signature):
                 self.assertEqual(result, parse_signature(signature))
 
+    def test_unterminated_args(self) -> None:
+        """
+        This must fail quickly, instead of backtracking through every way to split the arguments.
+        """
+        with self.assertRaises(RuntimeError):
+            parse_signature("Function foo(" + "a , " * 40 + "b")
+
+    def test_cached_results_are_not_shared(self) -> None:
+        """
+        Changing a parsed signature must not change the next result for the same line.
+        """
+        signature = parse_signature("Sub foo(a)")
+        signature.args.append(signature.args[0])
+        self.assertEqual(1, len(parse_signature("Sub foo(a)").args))
+
+    def test_cache_skips_other_lines(self) -> None:
+        """
+        Lines that do not start with a signature keyword are rejected before reaching the cache.
+        """
+        misses = parse_signature_parts.cache_info().misses
+        self.assertFalse(is_signature('Attribute VB_Name = "Module1"'))
+        self.assertFalse(is_signature("Option Explicit"))
+        self.assertEqual(misses, parse_signature_parts.cache_info().misses)
+
 
 if __name__ == "__main__":
     unittest.main(